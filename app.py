@@ -8,6 +8,9 @@ from supabase import create_client, Client
 import requests
 from io import BytesIO
 import base64
+from playlist_audio import render_playlist, OFFLINE_TTS_AVAILABLE
+from tag_index import TagIndex, keyword_tags
+from related_phrases import PhraseSimilarity
 
 # Streamlit 페이지 설정
 st.set_page_config(
@@ -21,6 +24,22 @@ st.set_page_config(
 SUPABASE_URL = st.secrets.get("SUPABASE_URL", "https://your-project-id.supabase.co")
 SUPABASE_ANON_KEY = st.secrets.get("SUPABASE_ANON_KEY", "your-anon-key")
 
+# 상황 카테고리 및 기본 태그 목록 (사이드바에서 사용자가 편집 가능)
+SITUATION_OPTIONS = [
+    "일상대화", "비즈니스", "여행", "쇼핑",
+    "레스토랑", "병원", "학교", "취미"
+]
+DEFAULT_TAG_VOCABULARY = {
+    '상황': SITUATION_OPTIONS,
+    '난이도': ["초급", "중급", "고급"],
+    '출처': [],
+    '사용자': [],
+}
+
+# 카드마다 보여줄 비슷한 표현 수 / 거의 같은 표현으로 볼 유사도
+RELATED_PHRASE_COUNT = 3
+NEAR_DUPLICATE_SCORE = 0.9
+
 # Supabase 클라이언트 초기화
 @st.cache_resource
 def init_supabase():
@@ -45,8 +64,22 @@ def init_session_state():
         st.session_state.search_performed = False
     if 'search_query' not in st.session_state:
         st.session_state.search_query = ""
-    if 'search_situation' not in st.session_state:
-        st.session_state.search_situation = "전체"
+    if 'search_tags_all' not in st.session_state:
+        st.session_state.search_tags_all = []
+    if 'search_tags_any' not in st.session_state:
+        st.session_state.search_tags_any = []
+    if 'search_tags_none' not in st.session_state:
+        st.session_state.search_tags_none = []
+    if 'tag_vocabulary' not in st.session_state:
+        st.session_state.tag_vocabulary = load_tag_vocabulary()
+    if 'tag_index' not in st.session_state:
+        rebuild_keyword_indexes()
+    if 'editing_id' not in st.session_state:
+        st.session_state.editing_id = None
+    if 'edit_message' not in st.session_state:
+        st.session_state.edit_message = None
+    if 'related_open_ids' not in st.session_state:
+        st.session_state.related_open_ids = set()
 
 # 로컬 데이터 로드
 def load_local_data():
@@ -58,6 +91,49 @@ def load_local_data():
                 st.session_state.keywords = data.get('keywords', [])
     except Exception as e:
         st.error(f"로컬 데이터 로드 오류: {e}")
+    rebuild_keyword_indexes()
+
+# 태그 목록 로드
+def load_tag_vocabulary():
+    """로컬 JSON 파일에서 사용자 태그 목록 로드 (없으면 기본 태그 목록)"""
+    vocabulary = {category: list(tags) for category, tags in DEFAULT_TAG_VOCABULARY.items()}
+    try:
+        if os.path.exists('keywords_data.json'):
+            with open('keywords_data.json', 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                vocabulary.update(data.get('tag_vocabulary', {}))
+    except Exception as e:
+        st.error(f"태그 목록 로드 오류: {e}")
+    return vocabulary
+
+# 키워드 인덱스 재생성 (키워드 목록 전체가 바뀐 경우에만 호출)
+def rebuild_keyword_indexes():
+    """현재 키워드 목록으로 태그 비트맵 인덱스 생성 (유사도 모델은 처음 필요할 때 생성)"""
+    st.session_state.tag_index = TagIndex(st.session_state.keywords)
+    st.session_state.phrase_similarity = None
+    st.session_state.related_open_ids = set()
+
+# 유사도 모델 (비슷한 표현을 처음 열 때 생성)
+def get_phrase_similarity():
+    """세션의 유사도 모델 반환 (없으면 현재 키워드 목록으로 생성)"""
+    if st.session_state.phrase_similarity is None:
+        with st.spinner("🔗 비슷한 표현 분석 중..."):
+            st.session_state.phrase_similarity = PhraseSimilarity(st.session_state.keywords)
+    return st.session_state.phrase_similarity
+
+# Supabase 행을 로컬 키워드 형식으로 변환
+def convert_supabase_row(item):
+    """Supabase 데이터를 로컬 형식으로 변환 (Supabase ID 유지)"""
+    return {
+        'id': str(item['id']),  # Supabase ID 사용
+        'supabase_id': item['id'],  # 원본 Supabase ID 보존
+        'korean': item['korean'],
+        'english': item['english'],
+        'situation': item['situation'],
+        'tags': item.get('tags') or [item['situation']],
+        'createdAt': item['created_at'],
+        'updatedAt': item.get('updated_at')  # 동시 수정 감지용
+    }
 
 # 로컬 데이터 저장
 def save_local_data():
@@ -65,6 +141,7 @@ def save_local_data():
     try:
         data = {
             'keywords': st.session_state.keywords,
+            'tag_vocabulary': st.session_state.tag_vocabulary,
             'saved_at': datetime.now().isoformat(),
             'version': '1.0.0'
         }
@@ -73,19 +150,49 @@ def save_local_data():
     except Exception as e:
         st.error(f"로컬 데이터 저장 오류: {e}")
 
+# 태그 분류 조회
+def tag_category(tag):
+    """태그가 속한 분류 이름 (태그 목록에 없으면 '사용자')"""
+    for category, tags in st.session_state.tag_vocabulary.items():
+        if tag in tags:
+            return category
+    return '사용자'
+
+# 필터에 사용할 전체 태그 목록
+def all_tag_options():
+    """태그 목록 + 키워드에만 있는 태그 (분류 순서대로)"""
+    options = []
+    for tags in st.session_state.tag_vocabulary.values():
+        options.extend(t for t in tags if t not in options)
+    options.extend(t for t in st.session_state.tag_index.counts if t not in options)
+    return options
+
+# 상황 외 분류의 태그 목록
+def extra_tag_options():
+    """상황 외 분류(난이도, 출처, 사용자 태그)의 태그 목록"""
+    return [
+        tag for category, tags in st.session_state.tag_vocabulary.items()
+        if category != '상황' for tag in tags
+    ]
+
 # Supabase에 키워드 저장
 def save_to_supabase(keyword_data):
     """Supabase에 키워드 저장"""
     supabase = init_supabase()
     if supabase:
         try:
-            result = supabase.table('english_tutor').insert({
+            row = {
                 'korean': keyword_data['korean'],
                 'english': keyword_data['english'],
                 'situation': keyword_data['situation'],
                 'user_email': 'doyousee2@naver.com',
-                'created_at': keyword_data['createdAt']
-            }).execute()
+                'created_at': keyword_data['createdAt'],
+                'updated_at': keyword_data['updatedAt']
+            }
+            # 상황 외 태그가 있을 때만 tags 컬럼 사용 (tags 컬럼이 없는 기존 테이블에서도 저장되도록)
+            if keyword_data['tags'] != [keyword_data['situation']]:
+                row['tags'] = keyword_data['tags']
+            result = supabase.table('english_tutor').insert(row).execute()
             # 저장된 데이터에서 Supabase ID 반환
             if result.data and len(result.data) > 0:
                 return result.data[0]['id']
@@ -109,14 +216,17 @@ def load_from_supabase():
     return []
 
 # 키워드 추가 함수
-def add_keyword(korean, english, situation):
+def add_keyword(korean, english, situation, tags=None):
     """새 키워드 추가"""
+    created_at = datetime.now().isoformat()
     new_keyword = {
         'id': str(int(datetime.now().timestamp() * 1000)),
         'korean': korean,
         'english': english,
         'situation': situation,
-        'createdAt': datetime.now().isoformat()
+        'tags': keyword_tags({'situation': situation, 'tags': tags}),
+        'createdAt': created_at,
+        'updatedAt': created_at
     }
     
     # 로컬에 추가
@@ -133,6 +243,11 @@ def add_keyword(korean, english, situation):
         new_keyword['supabase_id'] = supabase_id
         st.session_state.keywords[0] = new_keyword  # 첫 번째 항목 업데이트
     
+    # 태그 인덱스와 유사도 모델에 추가 (최종 ID 확정 후, 모델은 생성된 경우에만)
+    st.session_state.tag_index.add(new_keyword)
+    if st.session_state.phrase_similarity is not None:
+        st.session_state.phrase_similarity.add(new_keyword)
+    
     return True
 
 # 키워드 삭제 함수
@@ -166,7 +281,116 @@ def delete_keyword(keyword_id):
             
     # 로컬에서 삭제
     st.session_state.keywords = [k for k in st.session_state.keywords if k['id'] != keyword_id]
+    st.session_state.tag_index.remove(keyword_id)
+    if st.session_state.phrase_similarity is not None:
+        st.session_state.phrase_similarity.remove(keyword_id)
+    save_local_data()
+
+# 키워드 수정 내용 적용
+def apply_keyword_changes(keyword, changes):
+    """키워드에 변경 내용을 적용한 새 키워드 반환 (상황이 바뀌면 상황 태그도 교체)"""
+    updated = {**keyword, **changes}
+    if 'tags' not in changes:
+        other_tags = [t for t in keyword_tags(keyword) if t != keyword['situation']]
+        updated['tags'] = keyword_tags({'situation': updated['situation'], 'tags': other_tags})
+    return updated
+
+# Supabase에서 일괄 수정
+def bulk_update_supabase(updated_keywords):
+    """
+    키워드 여러 개를 한 번의 RPC 요청으로 수정
+    각 행은 updated_at이 마지막으로 읽은 값과 같을 때만 수정되며, 수정된 행 목록을 반환
+    (다른 세션에서 먼저 수정하거나 삭제한 행은 결과에서 빠짐)
+    """
+    supabase = init_supabase()
+    result = supabase.rpc('bulk_update_english_tutor', {
+        'updates': [
+            {
+                'id': k['supabase_id'],
+                'korean': k['korean'],
+                'english': k['english'],
+                'situation': k['situation'],
+                'tags': k['tags'],
+                'expected_updated_at': k.get('updatedAt')
+            }
+            for k in updated_keywords
+        ]
+    }).execute()
+    return result.data or []
+
+# 키워드 수정 함수 (단건/일괄 공용)
+def update_keywords(changes_by_id):
+    """
+    키워드 여러 개를 한 번에 수정
+    changes_by_id: {키워드 ID: {'korean'/'english'/'situation'/'tags': 새 값}}
+    반환값: (수정된 개수, 충돌로 반영하지 못한 개수, 다른 세션에서 삭제된 개수), Supabase 오류 시 None
+    """
+    keywords_by_id = {k['id']: k for k in st.session_state.keywords}
+    updated = {
+        keyword_id: apply_keyword_changes(keywords_by_id[keyword_id], changes)
+        for keyword_id, changes in changes_by_id.items()
+        if keyword_id in keywords_by_id
+    }
+    conflicted_ids = []
+    deleted_ids = []
+    
+    # Supabase에 저장된 키워드는 한 번의 요청으로 수정 (updated_at 비교로 동시 수정 감지)
+    remote = [k for k in updated.values() if k.get('supabase_id')]
+    supabase = init_supabase()
+    if supabase and remote:
+        # 이전 버전 로컬 파일에서 불러온 키워드는 updatedAt이 없어 항상 충돌하므로 서버의 현재 값으로 채움
+        legacy = [k for k in remote if not k.get('updatedAt')]
+        try:
+            if legacy:
+                result = supabase.table('english_tutor').select("id, updated_at").in_(
+                    'id', [k['supabase_id'] for k in legacy]
+                ).execute()
+                server_updated_at = {row['id']: row['updated_at'] for row in result.data}
+                for keyword in legacy:
+                    keyword['updatedAt'] = server_updated_at.get(keyword['supabase_id'])
+            saved_rows = {row['id']: row for row in bulk_update_supabase(remote)}
+        except Exception as e:
+            st.error(f"❌ Supabase 수정 오류: {e}")
+            return None
+        
+        for keyword in remote:
+            row = saved_rows.get(keyword['supabase_id'])
+            if row:
+                keyword['updatedAt'] = row['updated_at']
+            else:
+                conflicted_ids.append(keyword['id'])
+                del updated[keyword['id']]
+    updated_count = len(updated)
+    
+    if conflicted_ids:
+        # 충돌한 키워드는 서버의 최신 내용으로 교체 (다시 수정할 수 있도록)
+        # 서버에서 찾을 수 없는 키워드는 다른 세션에서 삭제된 것이므로 로컬에서도 제거
+        try:
+            result = supabase.table('english_tutor').select("*").in_(
+                'id', [keywords_by_id[kid]['supabase_id'] for kid in conflicted_ids]
+            ).execute()
+            for item in result.data:
+                latest = convert_supabase_row(item)
+                updated[latest['id']] = latest
+            deleted_ids = [kid for kid in conflicted_ids if kid not in updated]
+        except Exception as e:
+            st.error(f"❌ Supabase 최신 데이터 로드 오류: {e}")
+    
+    # 로컬 목록과 인덱스에 반영 (인덱스는 일괄 갱신, 로컬 파일 저장은 한 번만)
+    deleted = set(deleted_ids)
+    st.session_state.keywords = [
+        updated.get(k['id'], k) for k in st.session_state.keywords if k['id'] not in deleted
+    ]
+    for keyword_id in deleted_ids:
+        st.session_state.tag_index.remove(keyword_id)
+    st.session_state.tag_index.update_many(updated)
+    if st.session_state.phrase_similarity is not None:
+        for keyword_id in deleted_ids:
+            st.session_state.phrase_similarity.remove(keyword_id)
+        st.session_state.phrase_similarity.update_many(updated)
     save_local_data()
+    
+    return updated_count, len(conflicted_ids) - len(deleted_ids), len(deleted_ids)
 
 # TTS 음성 재생 함수
 def play_tts(text, lang='ko', voice_gender='여성'):
@@ -264,17 +488,9 @@ def main():
                 supabase_data = load_from_supabase()
                 if supabase_data:
                     # Supabase 데이터를 로컬 형식으로 변환
-                    converted_data = []
-                    for item in supabase_data:
-                        converted_data.append({
-                            'id': str(item['id']),
-                            'supabase_id': item['id'],
-                            'korean': item['korean'],
-                            'english': item['english'],
-                            'situation': item['situation'],
-                            'createdAt': item['created_at']
-                        })
+                    converted_data = [convert_supabase_row(item) for item in supabase_data]
                     st.session_state.keywords = converted_data
+                    rebuild_keyword_indexes()
                     # 로컬에도 저장 (백업용)
                     save_local_data()
                     # 자동 로드 성공 표시
@@ -317,17 +533,9 @@ def main():
                 supabase_data = load_from_supabase()
                 if supabase_data:
                     # Supabase 데이터를 로컬 형식으로 변환 (Supabase ID 유지)
-                    converted_data = []
-                    for item in supabase_data:
-                        converted_data.append({
-                            'id': str(item['id']),  # Supabase ID 사용
-                            'supabase_id': item['id'],  # 원본 Supabase ID 보존
-                            'korean': item['korean'],
-                            'english': item['english'],
-                            'situation': item['situation'],
-                            'createdAt': item['created_at']
-                        })
+                    converted_data = [convert_supabase_row(item) for item in supabase_data]
                     st.session_state.keywords = converted_data
+                    rebuild_keyword_indexes()
                     save_local_data()
                     st.success(f"✅ {len(supabase_data)}개 키워드 새로고침 완료")
                     st.rerun()
@@ -351,14 +559,44 @@ def main():
         st.metric("총 키워드 수", total_keywords)
         
         if st.session_state.keywords:
-            situations = {}
-            for keyword in st.session_state.keywords:
-                sit = keyword['situation']
-                situations[sit] = situations.get(sit, 0) + 1
+            # 태그 인덱스에서 증분 관리되는 태그별 개수 사용
+            tag_counts = st.session_state.tag_index.counts
+            by_category = {}
+            for tag, count in tag_counts.items():
+                by_category.setdefault(tag_category(tag), []).append((tag, count))
             
-            st.write("**상황별 분포:**")
-            for situation, count in situations.items():
-                st.write(f"• {situation}: {count}개")
+            for category, items in by_category.items():
+                st.write(f"**{category}별 분포:**")
+                for tag, count in items:
+                    st.write(f"• {tag}: {count}개")
+        
+        # 태그 관리
+        st.header("🏷️ 태그 관리")
+        vocabulary = st.session_state.tag_vocabulary
+        tag_category_input = st.selectbox("태그 분류", list(vocabulary.keys()), key="tag_category_select")
+        new_tag = st.text_input("새 태그", placeholder="추가할 태그를 입력하세요", key="new_tag_input")
+        if st.button("➕ 태그 추가", use_container_width=True):
+            new_tag = new_tag.strip()
+            if not new_tag:
+                st.error("❌ 태그 이름을 입력해주세요.")
+            elif any(new_tag in tags for tags in vocabulary.values()):
+                st.warning(f"⚠️ '{new_tag}' 태그가 이미 있습니다")
+            else:
+                vocabulary[tag_category_input].append(new_tag)
+                save_local_data()
+                st.rerun()
+        
+        removable_tags = vocabulary[tag_category_input]
+        if removable_tags:
+            tag_to_remove = st.selectbox("삭제할 태그", removable_tags, key="remove_tag_select")
+            if st.button("🗑️ 태그 삭제", use_container_width=True):
+                if tag_category_input == '상황' and len(removable_tags) == 1:
+                    st.error("❌ 상황 카테고리는 최소 한 개 이상 있어야 합니다.")
+                else:
+                    # 키워드에 붙은 태그는 그대로 두고 선택 목록에서만 제거
+                    removable_tags.remove(tag_to_remove)
+                    save_local_data()
+                    st.rerun()
     
     # 키워드 추가 섹션
     st.header("➕ 키워드 추가")
@@ -371,18 +609,18 @@ def main():
             english_input = st.text_input("영어", placeholder="영어 키워드를 입력하세요")
         
         with col2:
-            situation_options = [
-                "일상대화", "비즈니스", "여행", "쇼핑", 
-                "레스토랑", "병원", "학교", "취미"
-            ]
-            situation_input = st.selectbox("상황 카테고리", situation_options)
-            st.info("💡 사이드바에서 기본 음성 성별을 선택할 수 있습니다")
+            situation_input = st.selectbox("상황 카테고리", st.session_state.tag_vocabulary['상황'])
+            tags_input = st.multiselect(
+                "태그", extra_tag_options(),
+                format_func=lambda tag: f"{tag_category(tag)} · {tag}"
+            )
+            st.info("💡 사이드바에서 기본 음성 성별과 태그 목록을 설정할 수 있습니다")
         
         submitted = st.form_submit_button("📝 키워드 추가", use_container_width=True)
         
         if submitted:
             if korean_input and english_input and situation_input:
-                if add_keyword(korean_input, english_input, situation_input):
+                if add_keyword(korean_input, english_input, situation_input, tags_input):
                     st.success("✅ 키워드가 성공적으로 추가되었습니다!")
                     st.rerun()
             else:
@@ -397,24 +635,25 @@ def main():
 
     
     # 검색 및 필터링 섹션
-    col_search, col_situation = st.columns([3, 2])
-    
-    with col_search:
-        search_input = st.text_input(
-            "🔍 키워드 검색", 
-            placeholder="한국어 또는 영어로 검색하세요...",
-            key="search_input_field",
-            help="입력한 검색어가 포함된 키워드를 찾습니다"
-        )
+    search_input = st.text_input(
+        "🔍 키워드 검색", 
+        placeholder="한국어 또는 영어로 검색하세요...",
+        key="search_input_field",
+        help="입력한 검색어가 포함된 키워드를 찾습니다"
+    )
     
-    with col_situation:
-        # 키워드 추가 시와 동일한 상황 카테고리 옵션 사용
-        situation_options = [
-            "일상대화", "비즈니스", "여행", "쇼핑", 
-            "레스토랑", "병원", "학교", "취미"
-        ]
-        all_situations = ["전체"] + situation_options
-        situation_input = st.selectbox("🎯 상황 필터", all_situations, key="situation_filter")
+    # 태그 필터 (AND / OR / NOT 조합)
+    tag_options = all_tag_options()
+    tag_counts = st.session_state.tag_index.counts
+    format_tag = lambda tag: f"{tag} ({tag_counts.get(tag, 0)})"
+    col_tags_all, col_tags_any, col_tags_none = st.columns([1, 1, 1])
+    
+    with col_tags_all:
+        tags_all_input = st.multiselect("🎯 모두 포함 (AND)", tag_options, format_func=format_tag, key="tags_all_filter")
+    with col_tags_any:
+        tags_any_input = st.multiselect("🔀 하나 이상 포함 (OR)", tag_options, format_func=format_tag, key="tags_any_filter")
+    with col_tags_none:
+        tags_none_input = st.multiselect("🚫 제외 (NOT)", tag_options, format_func=format_tag, key="tags_none_filter")
     
     # 검색 및 초기화 버튼
     col_search_btn, col_clear_btn = st.columns([1, 1])
@@ -423,46 +662,46 @@ def main():
         if st.button("🔍 검색", use_container_width=True, type="primary"):
             st.session_state.search_performed = True
             st.session_state.search_query = search_input
-            st.session_state.search_situation = situation_input
+            st.session_state.search_tags_all = tags_all_input
+            st.session_state.search_tags_any = tags_any_input
+            st.session_state.search_tags_none = tags_none_input
             st.rerun()
     
     with col_clear_btn:
         if st.button("🔄 전체보기", use_container_width=True):
             st.session_state.search_performed = False
             st.session_state.search_query = ""
-            st.session_state.search_situation = "전체"
-            # 검색창과 상황 필터 초기화를 위해 키를 안전하게 처리
-            if 'search_input_field' in st.session_state:
-                del st.session_state.search_input_field
-            if 'situation_filter' in st.session_state:
-                del st.session_state.situation_filter
+            st.session_state.search_tags_all = []
+            st.session_state.search_tags_any = []
+            st.session_state.search_tags_none = []
+            # 검색창과 태그 필터 초기화를 위해 키를 안전하게 처리
+            for widget_key in ['search_input_field', 'tags_all_filter', 'tags_any_filter', 'tags_none_filter']:
+                if widget_key in st.session_state:
+                    del st.session_state[widget_key]
             st.rerun()
     
     # 검색 및 필터링 적용
     if st.session_state.search_performed:
-        # 검색이 수행된 경우에만 필터링
-        filtered_keywords = st.session_state.keywords
-        
-        # 상황 필터링 (AND 조건)
-        if st.session_state.search_situation != "전체":
-            filtered_keywords = [k for k in filtered_keywords if k['situation'] == st.session_state.search_situation]
+        # 검색이 수행된 경우에만 필터링 (태그 비트맵 AND/OR/NOT + 검색어 AND 조건)
+        filtered_keywords = st.session_state.tag_index.query(
+            all_tags=st.session_state.search_tags_all,
+            any_tags=st.session_state.search_tags_any,
+            none_tags=st.session_state.search_tags_none,
+            text=st.session_state.search_query
+        )
         
-        # 검색어 필터링 (AND 조건)
+        # 검색 결과 표시
+        search_conditions = []
         if st.session_state.search_query:
-            search_query_lower = st.session_state.search_query.lower()
-            filtered_keywords = [
-                k for k in filtered_keywords 
-                if search_query_lower in k['korean'].lower() or search_query_lower in k['english'].lower()
-            ]
+            search_conditions.append(f"키워드: '{st.session_state.search_query}'")
+        if st.session_state.search_tags_all:
+            search_conditions.append(f"모두 포함: {', '.join(st.session_state.search_tags_all)}")
+        if st.session_state.search_tags_any:
+            search_conditions.append(f"하나 이상: {', '.join(st.session_state.search_tags_any)}")
+        if st.session_state.search_tags_none:
+            search_conditions.append(f"제외: {', '.join(st.session_state.search_tags_none)}")
         
-        # 검색 결과 표시
-        if st.session_state.search_query or st.session_state.search_situation != "전체":
-            search_conditions = []
-            if st.session_state.search_query:
-                search_conditions.append(f"키워드: '{st.session_state.search_query}'")
-            if st.session_state.search_situation != "전체":
-                search_conditions.append(f"상황: '{st.session_state.search_situation}'")
-            
+        if search_conditions:
             condition_text = " + ".join(search_conditions)
             
             if filtered_keywords:
@@ -478,11 +717,120 @@ def main():
     else:
         st.write(f"🔢 **{len(filtered_keywords)}개 키워드 발견**")
         
+        # 수정 결과 메시지 (rerun 후에도 한 번 표시)
+        if st.session_state.edit_message:
+            level, message = st.session_state.edit_message
+            getattr(st, level)(message)
+            st.session_state.edit_message = None
+        
+        # 현재 목록 일괄 수정 (상황 재지정 / 찾아 바꾸기)
+        with st.expander(f"🛠️ 현재 목록 {len(filtered_keywords)}개 일괄 수정"):
+            col_bulk_situation, col_bulk_target = st.columns([1, 1])
+            with col_bulk_situation:
+                bulk_situation = st.selectbox(
+                    "상황 카테고리 변경", ["변경 안 함"] + st.session_state.tag_vocabulary['상황'],
+                    key="bulk_situation"
+                )
+            with col_bulk_target:
+                bulk_target = st.selectbox("찾아 바꿀 대상", ["한국어 + 영어", "한국어", "영어"], key="bulk_target")
+            
+            col_find, col_replace = st.columns([1, 1])
+            with col_find:
+                bulk_find = st.text_input("찾을 내용", key="bulk_find")
+            with col_replace:
+                bulk_replace = st.text_input("바꿀 내용", key="bulk_replace")
+            
+            if st.button("✅ 일괄 수정 적용", use_container_width=True):
+                fields = []
+                if bulk_target in ("한국어 + 영어", "한국어"):
+                    fields.append('korean')
+                if bulk_target in ("한국어 + 영어", "영어"):
+                    fields.append('english')
+                
+                # 실제로 바뀌는 키워드만 모아서 한 번에 수정
+                bulk_changes = {}
+                for keyword in filtered_keywords:
+                    changes = {}
+                    if bulk_situation != "변경 안 함" and keyword['situation'] != bulk_situation:
+                        changes['situation'] = bulk_situation
+                    if bulk_find:
+                        for field in fields:
+                            replaced = keyword[field].replace(bulk_find, bulk_replace)
+                            if replaced != keyword[field] and replaced.strip():
+                                changes[field] = replaced
+                    if changes:
+                        bulk_changes[keyword['id']] = changes
+                
+                if not bulk_changes:
+                    st.info("📭 변경할 키워드가 없습니다")
+                else:
+                    result = update_keywords(bulk_changes)
+                    if result:
+                        updated_count, conflict_count, deleted_count = result
+                        if conflict_count or deleted_count:
+                            message = f"⚠️ {updated_count}개 수정 완료"
+                            if conflict_count:
+                                message += f", {conflict_count}개는 다른 세션에서 먼저 수정되어 반영하지 않았습니다 (최신 내용으로 새로고침됨)"
+                            if deleted_count:
+                                message += f", {deleted_count}개는 다른 세션에서 삭제되어 목록에서 제거했습니다"
+                            st.session_state.edit_message = ('warning', message)
+                        else:
+                            st.session_state.edit_message = ('success', f"✅ {updated_count}개 키워드 일괄 수정 완료")
+                        st.rerun()
+        
+        # '비슷한 표현 보기'를 연 키워드만 계산 (모델 안에 캐시되어 rerun마다 다시 계산하지 않음)
+        related_ids = [k['id'] for k in filtered_keywords if k['id'] in st.session_state.related_open_ids]
+        related_phrases = {}
+        if related_ids:
+            related_phrases = get_phrase_similarity().neighbors(related_ids, k=RELATED_PHRASE_COUNT)
+        
+        # 현재 목록을 하나의 음성 파일로 만들기 (통근길 학습용)
+        with st.expander("🎧 현재 목록을 음성 파일로 만들기"):
+            if not OFFLINE_TTS_AVAILABLE:
+                st.warning("⚠️ 오프라인 음성 합성을 사용하려면 pyttsx3 패키지가 필요합니다 (pip install pyttsx3)")
+            else:
+                st.caption("한국어 → 잠깐 쉼 → 영어 순서로 현재 목록 전체를 하나의 WAV 파일로 만듭니다")
+                col_pause, col_gap = st.columns([1, 1])
+                with col_pause:
+                    pause_ms = st.slider("한국어/영어 사이 쉼 (ms)", 200, 3000, 700, step=100)
+                with col_gap:
+                    gap_ms = st.slider("키워드 사이 쉼 (ms)", 500, 5000, 1500, step=100)
+                
+                if st.button(f"🎙️ {len(filtered_keywords)}개 키워드 음성 파일 만들기", use_container_width=True):
+                    progress_bar = st.progress(0.0, text="음성 합성 준비 중...")
+                    
+                    def update_progress(done, total):
+                        progress_bar.progress(done / total, text=f"음성 합성 중... {done}/{total}")
+                    
+                    try:
+                        playlist_audio = render_playlist(
+                            filtered_keywords,
+                            voice_gender=st.session_state.voice_gender,
+                            pause_ms=pause_ms,
+                            gap_ms=gap_ms,
+                            on_progress=update_progress
+                        )
+                    except Exception as e:
+                        st.error(f"❌ 음성 파일 생성 오류: {e}")
+                    else:
+                        # 세션에 보관하지 않고 생성한 실행에서만 내려보냄 (다음 rerun에서 서버 메모리에서 해제됨)
+                        st.success(f"✅ {len(filtered_keywords)}개 키워드 음성 파일 생성 완료")
+                        st.audio(playlist_audio, format="audio/wav")
+                        st.download_button(
+                            "⬇️ WAV 파일 다운로드",
+                            data=playlist_audio,
+                            file_name=f"english_tutor_playlist_{datetime.now().strftime('%Y%m%d_%H%M')}.wav",
+                            mime="audio/wav",
+                            use_container_width=True
+                        )
+                        st.caption("💡 다른 버튼을 누르면 플레이어가 사라지니 먼저 다운로드해 주세요")
+        
         # 키워드 표시
         for i, keyword in enumerate(filtered_keywords):
             with st.container():
                 # 고유 ID 생성
-                unique_id = abs(hash(keyword['korean'] + keyword['english'])) % 100000
+                # 위젯 키는 키워드 ID로 (같은 내용의 중복 키워드도 키가 겹치지 않도록)
+                unique_id = keyword['id']
                 
                 # 키워드 카드와 삭제 버튼을 함께 표시
                 col_card, col_del = st.columns([9, 1])
@@ -490,18 +838,100 @@ def main():
                 with col_card:
                     # 키워드 정보를 Streamlit 컴포넌트로만 깔끔하게 표시
                     with st.container():
-                        # 키워드 제목
-                        st.markdown(f"### {keyword['korean']}")
-                        st.markdown(f"**{keyword['english']}**")
+                        if st.session_state.editing_id == keyword['id']:
+                            # 인라인 수정 폼
+                            with st.form(f"edit_form_{keyword['id']}"):
+                                edit_korean = st.text_input("한국어", value=keyword['korean'])
+                                edit_english = st.text_input("영어", value=keyword['english'])
+                                situation_choices = st.session_state.tag_vocabulary['상황']
+                                if keyword['situation'] not in situation_choices:
+                                    situation_choices = [keyword['situation']] + situation_choices
+                                edit_situation = st.selectbox(
+                                    "상황 카테고리", situation_choices,
+                                    index=situation_choices.index(keyword['situation'])
+                                )
+                                current_tags = keyword_tags(keyword)[1:]
+                                tag_choices = extra_tag_options() + [t for t in current_tags if t not in extra_tag_options()]
+                                edit_tags = st.multiselect(
+                                    "태그", tag_choices, default=current_tags,
+                                    format_func=lambda tag: f"{tag_category(tag)} · {tag}"
+                                )
+                                
+                                col_save, col_cancel = st.columns([1, 1])
+                                with col_save:
+                                    save_clicked = st.form_submit_button("💾 저장", use_container_width=True)
+                                with col_cancel:
+                                    cancel_clicked = st.form_submit_button("취소", use_container_width=True)
+                            
+                            if save_clicked:
+                                if edit_korean and edit_english:
+                                    # 실제로 바뀐 항목만 전송 (변경 없는 저장이 서버 updated_at을 바꿔 다른 세션에 충돌을 만들지 않도록)
+                                    edited = {
+                                        'korean': edit_korean,
+                                        'english': edit_english,
+                                        'situation': edit_situation,
+                                        'tags': keyword_tags({'situation': edit_situation, 'tags': edit_tags})
+                                    }
+                                    changes = {
+                                        field: value for field, value in edited.items()
+                                        if value != (keyword_tags(keyword) if field == 'tags' else keyword[field])
+                                    }
+                                    result = update_keywords({keyword['id']: changes}) if changes else (0, 0, 0)
+                                    if result:
+                                        if not changes:
+                                            st.session_state.edit_message = ('info', "📭 변경된 내용이 없습니다.")
+                                        elif result[2]:
+                                            st.session_state.edit_message = ('warning', (
+                                                "⚠️ 다른 세션에서 삭제된 키워드입니다. 목록에서 제거했습니다."
+                                            ))
+                                        elif result[1]:
+                                            st.session_state.edit_message = ('warning', (
+                                                "⚠️ 다른 세션에서 먼저 수정된 키워드입니다. "
+                                                "최신 내용으로 새로고침했으니 다시 수정해주세요."
+                                            ))
+                                        else:
+                                            st.session_state.edit_message = ('success', "✅ 키워드가 수정되었습니다.")
+                                        st.session_state.editing_id = None
+                                        st.rerun()
+                                else:
+                                    st.error("❌ 한국어와 영어를 모두 입력해주세요.")
+                            if cancel_clicked:
+                                st.session_state.editing_id = None
+                                st.rerun()
+                        else:
+                            # 키워드 제목
+                            st.markdown(f"### {keyword['korean']}")
+                            st.markdown(f"**{keyword['english']}**")
                         
                         # 메타데이터
                         col_meta1, col_meta2 = st.columns([1, 1])
                         with col_meta1:
                             st.info(f"📂 {keyword['situation']}")
+                            extra_tags = keyword_tags(keyword)[1:]
+                            if extra_tags:
+                                st.caption("🏷️ " + " · ".join(extra_tags))
                         with col_meta2:
                             created_time = datetime.fromisoformat(keyword['createdAt']).strftime('%Y-%m-%d %H:%M')
                             st.caption(f"🕒 {created_time}")
                         
+                        # 비슷한 표현 (버튼을 눌렀을 때만 계산)
+                        if keyword['id'] in related_phrases:
+                            neighbors = related_phrases[keyword['id']]
+                            if neighbors:
+                                if neighbors[0][1] >= NEAR_DUPLICATE_SCORE:
+                                    st.warning("⚠️ 거의 같은 표현이 이미 있습니다")
+                                st.write("🔗 **비슷한 표현:**")
+                                for neighbor, score in neighbors:
+                                    st.write(f"• {neighbor['korean']} — {neighbor['english']} ({score:.0%})")
+                            else:
+                                st.caption("🔗 비슷한 표현이 없습니다")
+                            if st.button("🔗 비슷한 표현 닫기", key=f"related_close_{unique_id}"):
+                                st.session_state.related_open_ids.discard(keyword['id'])
+                                st.rerun()
+                        elif st.button("🔗 비슷한 표현 보기", key=f"related_{unique_id}"):
+                            st.session_state.related_open_ids.add(keyword['id'])
+                            st.rerun()
+                        
                         # 음성 버튼들
                         st.write("🔊 **음성 재생:**")
                         col_kr, col_en, col_both = st.columns([1, 1, 1])
@@ -599,6 +1029,11 @@ def main():
                                 components.html(tts_both_html, height=60)
                 
                 with col_del:
+                    # 수정 버튼
+                    if st.button("✏️", key=f"edit_{keyword['id']}", help="키워드 수정", use_container_width=True):
+                        st.session_state.editing_id = keyword['id']
+                        st.rerun()
+                    
                     # 삭제 버튼 (Streamlit 버튼)
                     if st.button("🗑️", key=f"del_{keyword['id']}", help="키워드 삭제", use_container_width=True):
                         delete_keyword(keyword['id'])
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+동시 접속 부하 테스트 스크립트
+시나리오마다 `streamlit run`과 같은 방식으로 app.py 서버 프로세스를 띄우고,
+헤드리스 웹소켓 클라이언트 N개가 동시에 접속해
+검색 / 음성 재생 / 키워드 추가 / 수정 / 삭제를 섞어 수행합니다.
+재실행(rerun) 지연 시간 분위수, 세션당 서버 메모리(RSS 증가량), 백엔드 요청 수를 보고합니다.
+
+서버 프로세스 안의 Supabase는 지연 시간을 주입할 수 있는 메모리 백엔드로 대체됩니다.
+
+사용 예:
+    python load_test.py --sessions 1,5,10 --library-sizes 50,200,500 --actions 20 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+STATS_FILE = 'backend_stats.json'
+
+# 시뮬레이션 세션이 수행하는 동작과 비율
+ACTION_WEIGHTS = {
+    'search': 40,
+    'tts': 35,
+    'add': 10,
+    'edit': 5,
+    'delete': 10,
+}
+
+SITUATIONS = ["일상대화", "비즈니스", "여행", "쇼핑", "레스토랑", "병원", "학교", "취미"]
+SEARCH_TERMS = ["회의", "meeting", "주문", "order", "예약", "ticket", "1", "표현", "phrase", ""]
+
+
+class FakeSupabase:
+    """app.py가 사용하는 supabase 클라이언트 API만 흉내 내는 메모리 백엔드"""
+
+    def __init__(self, latency_ms=0, stats_path=None):
+        self.latency = latency_ms / 1000
+        self.stats_path = stats_path  # 종료 시 요청 수를 부하 테스트 프로세스에 전달할 파일
+        self.requests = Counter()
+        self.rows = []
+        self._next_id = 1
+        # 여러 세션의 스크립트 스레드가 동시에 호출하므로 데이터/집계는 잠금 안에서만 변경
+        self._lock = threading.Lock()
+
+    def reset(self, library_size):
+        """백엔드 데이터를 library_size개 키워드로 초기화"""
+        with self._lock:
+            self.requests = Counter()
+            self.rows = []
+            self._next_id = 1
+            created = datetime(2024, 1, 1)
+            for i in range(library_size):
+                self._insert({
+                    'korean': f"한국어 표현 {i} 회의 예약",
+                    'english': f"English phrase {i} meeting order",
+                    'situation': SITUATIONS[i % len(SITUATIONS)],
+                    'user_email': 'doyousee2@naver.com',
+                    'created_at': (created + timedelta(minutes=i)).isoformat(),
+                })
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+    def dump_stats(self):
+        """요청 수를 파일에 기록 (서버 종료 시 한 번만 호출)"""
+        if not self.stats_path:
+            return
+        with self._lock:
+            requests = dict(self.requests)
+        with open(self.stats_path, 'w', encoding='utf-8') as f:
+            json.dump(requests, f)
+
+    def _insert(self, row):
+        """행 추가 (호출한 쪽에서 잠금을 잡은 상태여야 함)"""
+        row = dict(row)
+        row['id'] = self._next_id
+        row.setdefault('updated_at', row.get('created_at'))
+        self._next_id += 1
+        self.rows.append(row)
+        return row
+
+    def _execute(self, query):
+        time.sleep(self.latency)  # 네트워크 지연은 잠금 밖에서 (요청끼리 겹칠 수 있도록)
+        with self._lock:
+            return self._execute_locked(query)
+
+    def _execute_locked(self, query):
+        self.requests[query.op] += 1
+        matched = [r for r in self.rows if query.matches(r)]
+        if query.op == 'select':
+            return SimpleNamespace(data=[dict(r) for r in matched])
+        if query.op == 'insert':
+            return SimpleNamespace(data=[dict(self._insert(query.payload))])
+        if query.op == 'update':
+            for r in matched:
+                r.update(query.payload)
+                r['updated_at'] = datetime.now().isoformat()
+            return SimpleNamespace(data=[dict(r) for r in matched])
+        if query.op == 'delete':
+            self.rows = [r for r in self.rows if not query.matches(r)]
+            return SimpleNamespace(data=[dict(r) for r in matched])
+        raise ValueError(f"지원하지 않는 요청: {query.op}")
+
+    def _bulk_update(self, updates):
+        """bulk_update_english_tutor 함수: updated_at이 일치하는 행만 수정 (잠금 안에서 호출)"""
+        rows_by_id = {r['id']: r for r in self.rows}
+        saved = []
+        for update in updates:
+            row = rows_by_id.get(update['id'])
+            if row is None or row.get('updated_at') != update['expected_updated_at']:
+                continue
+            for column in ('korean', 'english', 'situation', 'tags'):
+                row[column] = update[column]
+            row['updated_at'] = datetime.now().isoformat()
+            saved.append(dict(row))
+        return saved
+
+
+class FakeRpc:
+    """supabase.rpc(...) 흉내 (bulk_update_english_tutor만 지원)"""
+
+    def __init__(self, backend, name, params):
+        self.backend = backend
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        if self.name != 'bulk_update_english_tutor':
+            raise ValueError(f"지원하지 않는 함수: {self.name}")
+        time.sleep(self.backend.latency)
+        with self.backend._lock:
+            self.backend.requests['rpc'] += 1
+            return SimpleNamespace(data=self.backend._bulk_update(self.params['updates']))
+
+
+class FakeQuery:
+    """supabase 쿼리 빌더(select/insert/update/delete + eq/match/in_) 흉내"""
+
+    def __init__(self, backend, table_name):
+        self.backend = backend
+        self.table_name = table_name
+        self.op = None
+        self.payload = None
+        self.filters = {}
+        self.in_filters = {}
+
+    def select(self, *columns):
+        self.op = 'select'
+        return self
+
+    def insert(self, payload):
+        self.op = 'insert'
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.op = 'update'
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.op = 'delete'
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def match(self, conditions):
+        self.filters.update(conditions)
+        return self
+
+    def in_(self, column, values):
+        self.in_filters[column] = set(values)
+        return self
+
+    def matches(self, row):
+        return (all(row.get(c) == v for c, v in self.filters.items())
+                and all(row.get(c) in v for c, v in self.in_filters.items()))
+
+    def execute(self):
+        return self.backend._execute(self)
+
+
+def _percentile(values, p):
+    """p 분위수 (값이 하나뿐이어도 동작)"""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[p - 1]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _rss_bytes(pid):
+    """프로세스 RSS (리눅스 /proc 기준, 다른 OS에서는 None)"""
+    try:
+        with open(f'/proc/{pid}/status', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def serve(args):
+    """서버 모드: 가짜 백엔드를 끼운 채 현재 폴더에서 app.py를 실행 (load_test.py가 호출)"""
+    import supabase
+    from streamlit.web import bootstrap
+
+    backend = FakeSupabase(latency_ms=args.latency_ms, stats_path=STATS_FILE)
+    backend.reset(args.library_size)
+    # 요청 수는 종료 시 한 번만 기록 (SIGTERM도 Streamlit이 서버를 정상 종료하므로 atexit가 실행됨)
+    atexit.register(backend.dump_stats)
+    # app.py는 실행될 때마다 `from supabase import create_client`를 수행하므로 모듈 속성만 바꾸면 됨
+    supabase.create_client = lambda url, key: backend
+
+    flag_options = {
+        'server.port': args.port,
+        'server.headless': True,
+        'server.fileWatcherType': 'none',
+        'browser.gatherUsageStats': False,
+    }
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(APP_PATH, False, [], flag_options)
+
+
+class AppServer:
+    """시나리오 하나 동안 실행되는 app.py 서버 프로세스"""
+
+    def __init__(self, workdir, library_size, latency_ms, timeout):
+        self.workdir = workdir
+        self.port = _free_port()
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve',
+             '--port', str(self.port), '--library-size', str(library_size),
+             '--latency-ms', str(latency_ms)],
+            cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self._wait_ready(timeout)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def _wait_ready(self, timeout):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("app.py 서버가 시작되지 않았습니다")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1)
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("app.py 서버 시작 시간 초과")
+
+    def rss(self):
+        return _rss_bytes(self.process.pid)
+
+    def backend_requests(self):
+        path = os.path.join(self.workdir, STATS_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class HeadlessSession:
+    """웹소켓으로 접속한 가상 학습자 세션 하나 (브라우저 없이 Streamlit 프로토콜 사용)"""
+
+    def __init__(self, session_no, seed, timeout, think_ms):
+        self.session_no = session_no
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.think = think_ms / 1000
+        self.latencies = []
+        self.errors = Counter()
+        self.exceptions = Counter()  # 앱에서 발생한 예외 '종류: 메시지'별 횟수
+        self.widgets = []  # 마지막 실행에서 받은 위젯 (종류, 위젯 proto)
+        self.ws = None
+
+    async def connect(self, url):
+        import websockets
+        self.ws = await websockets.connect(url, subprotocols=['streamlit'], max_size=None)
+        await self._rerun()
+
+    async def close(self):
+        await self.ws.close()
+
+    async def _rerun(self, widget_states=()):
+        """위젯 상태와 함께 재실행 요청 후, 스크립트가 끝날 때까지 걸린 시간 반환"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+
+        widgets = []
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception':
+                    self.errors['exception'] += 1
+                    message = (element.exception.message or '').strip().splitlines()
+                    self.exceptions[f"{element.exception.type}: {message[0] if message else ''}"[:200]] += 1
+                widget = getattr(element, element_type)
+                if getattr(widget, 'id', ''):
+                    widgets.append((element_type, widget))
+            elif kind == 'script_finished':
+                # st.rerun()으로 이어지는 실행은 끝까지 기다림
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    widgets = []
+                    continue
+                break
+
+        elapsed = time.perf_counter() - start
+        self.widgets = widgets
+        return elapsed
+
+    async def _timed_rerun(self, widget_states):
+        self.latencies.append(await self._rerun(widget_states))
+
+    def _find(self, element_type, label=None, key_prefix=None):
+        """라벨 또는 키 접두어로 위젯 찾기 (위젯 ID 형식: $$ID-<해시>-<키>)"""
+        found = []
+        for found_type, widget in self.widgets:
+            if found_type != element_type:
+                continue
+            key = widget.id.split('-', 2)[-1]
+            if label is not None and widget.label == label:
+                found.append(widget)
+            elif key_prefix is not None and key.startswith(key_prefix):
+                found.append(widget)
+        return found
+
+    @staticmethod
+    def _state(widget, **value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        return WidgetState(id=widget.id, **value)
+
+    async def run_actions(self, n_actions):
+        for _ in range(n_actions):
+            if self.think:
+                await asyncio.sleep(self.rng.uniform(0, self.think))
+            action = self.rng.choices(list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values()))[0]
+            await getattr(self, f'_do_{action}')()
+
+    async def _do_search(self):
+        search_inputs = self._find('text_input', label="🔍 키워드 검색")
+        buttons = self._find('button', label="🔍 검색")
+        if not search_inputs or not buttons:
+            self.errors['search_missing'] += 1
+            return
+        await self._timed_rerun([
+            self._state(search_inputs[0], string_value=self.rng.choice(SEARCH_TERMS)),
+            self._state(buttons[0], trigger_value=True),
+        ])
+
+    async def _do_tts(self):
+        buttons = self._find('button', key_prefix=self.rng.choice(['kr_', 'en_', 'both_']))
+        if not buttons:
+            self.errors['tts_missing'] += 1
+            return
+        await self._timed_rerun([self._state(self.rng.choice(buttons), trigger_value=True)])
+
+    async def _do_add(self):
+        korean_inputs = self._find('text_input', label="한국어")
+        english_inputs = self._find('text_input', label="영어")
+        buttons = self._find('button', label="📝 키워드 추가")
+        if not korean_inputs or not english_inputs or not buttons:
+            self.errors['add_missing'] += 1
+            return
+        token = f"{self.session_no}-{self.rng.randrange(10 ** 9)}"
+        await self._timed_rerun([
+            self._state(korean_inputs[0], string_value=f"부하 테스트 표현 {token}"),
+            self._state(english_inputs[0], string_value=f"load test phrase {token}"),
+            self._state(buttons[0], trigger_value=True),
+        ])
+
+    async def _do_edit(self):
+        buttons = self._find('button', key_prefix='edit_')
+        if not buttons:
+            self.errors['edit_missing'] += 1
+            return
+        await self._timed_rerun([self._state(self.rng.choice(buttons), trigger_value=True)])
+
+        # 추가 폼 다음에 오는 수정 폼의 영어 입력란
+        english_inputs = self._find('text_input', label="영어")
+        buttons = self._find('button', label="💾 저장")
+        if len(english_inputs) < 2 or not buttons:
+            self.errors['edit_missing'] += 1
+            return
+        await self._timed_rerun([
+            self._state(english_inputs[-1], string_value=f"{english_inputs[-1].default} (edited)"),
+            self._state(buttons[0], trigger_value=True),
+        ])
+
+    async def _do_delete(self):
+        buttons = self._find('button', key_prefix='del_')
+        if not buttons:
+            self.errors['delete_missing'] += 1
+            return
+        await self._timed_rerun([self._state(self.rng.choice(buttons), trigger_value=True)])
+
+
+async def _drive_sessions(server, n_sessions, n_actions, seed, timeout, think_ms):
+    """세션을 모두 접속시킨 뒤 (메모리 측정) 동시에 동작 수행"""
+    sessions = [HeadlessSession(i, seed + i, timeout, think_ms) for i in range(n_sessions)]
+    base_rss = server.rss()
+    await asyncio.gather(*(s.connect(server.url) for s in sessions))
+    connected_rss = server.rss()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(s.run_actions(n_actions) for s in sessions))
+    elapsed = time.perf_counter() - start
+
+    await asyncio.gather(*(s.close() for s in sessions))
+    memory_per_session = None
+    if base_rss is not None and connected_rss is not None:
+        memory_per_session = (connected_rss - base_rss) / n_sessions
+    return sessions, elapsed, memory_per_session
+
+
+def run_scenario(workdir, n_sessions, library_size, args):
+    """세션 수 / 라이브러리 크기 조합 하나를 새 서버에서 실행하고 결과 집계"""
+    server = AppServer(workdir, library_size, args.latency_ms, args.timeout)
+    try:
+        # 서버 첫 실행(모듈 import 등) 비용이 측정에 섞이지 않도록 미리 한 번 접속
+        warmup = HeadlessSession(-1, args.seed, args.timeout, 0)
+        asyncio.run(_warm_up(warmup, server.url))
+
+        sessions, elapsed, memory_per_session = asyncio.run(_drive_sessions(
+            server, n_sessions, args.actions, args.seed, args.timeout, args.think_ms
+        ))
+    finally:
+        server.stop()
+    # 요청 수 파일은 서버가 종료될 때 기록됨
+    requests = server.backend_requests()
+
+    latencies = [l for s in sessions for l in s.latencies] or [0.0]
+    errors = sum((s.errors for s in sessions), Counter())
+    exceptions = sum((s.exceptions for s in sessions), Counter())
+    return {
+        'sessions': n_sessions,
+        'library': library_size,
+        'reruns': sum(len(s.latencies) for s in sessions),
+        'p50': _percentile(latencies, 50),
+        'p90': _percentile(latencies, 90),
+        'p99': _percentile(latencies, 99),
+        'max': max(latencies),
+        'throughput': len(latencies) / elapsed if elapsed else 0,
+        'memory_mb': memory_per_session / 1024 ** 2 if memory_per_session is not None else None,
+        'requests': requests,
+        'errors': dict(errors),
+        'exceptions': dict(exceptions),
+    }
+
+
+async def _warm_up(session, url):
+    await session.connect(url)
+    await session.close()
+
+
+def print_report(results):
+    print("\n📊 부하 테스트 결과 (동시 접속 세션 기준)")
+    print("=" * 100)
+    print(f"{'세션':>4} {'키워드':>7} {'rerun':>6} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} "
+          f"{'max(ms)':>9} {'rerun/s':>8} {'MB/세션':>8}  백엔드 요청")
+    print("-" * 100)
+    for r in results:
+        requests_text = ', '.join(f"{op}={count}" for op, count in sorted(r['requests'].items()))
+        memory_text = f"{r['memory_mb']:>8.1f}" if r['memory_mb'] is not None else f"{'-':>8}"
+        print(f"{r['sessions']:>4} {r['library']:>7} {r['reruns']:>6} "
+              f"{r['p50'] * 1000:>9.1f} {r['p90'] * 1000:>9.1f} {r['p99'] * 1000:>9.1f} "
+              f"{r['max'] * 1000:>9.1f} {r['throughput']:>8.1f} {memory_text}  {requests_text}")
+        if r['errors']:
+            print(f"     ⚠️ 오류: {r['errors']}")
+        for exception, count in sorted(r['exceptions'].items(), key=lambda item: -item[1]):
+            print(f"     💥 예외 {count}회: {exception}")
+    print("\n💡 MB/세션은 세션 접속 전후 서버 프로세스 RSS 증가량을 세션 수로 나눈 값입니다 (리눅스 전용)")
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py 동시 세션 부하 테스트")
+    parser.add_argument('--sessions', type=_int_list, default=[1, 5, 10],
+                        help="동시 세션 수 목록 (쉼표 구분)")
+    parser.add_argument('--library-sizes', type=_int_list, default=[50, 200, 500],
+                        help="백엔드 키워드 수 목록 (쉼표 구분)")
+    parser.add_argument('--actions', type=int, default=20, help="세션당 수행할 동작 수")
+    parser.add_argument('--latency-ms', type=float, default=50, help="백엔드 요청당 주입할 지연 시간")
+    parser.add_argument('--think-ms', type=float, default=200,
+                        help="동작 사이 최대 대기 시간 (0~값 사이에서 무작위)")
+    parser.add_argument('--timeout', type=float, default=120, help="rerun 한 번의 최대 대기 시간(초)")
+    parser.add_argument('--seed', type=int, default=0)
+    # 내부용: load_test.py가 띄우는 서버 프로세스 옵션
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--library-size', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    try:
+        import supabase  # noqa: F401
+        import streamlit  # noqa: F401
+        import websockets  # noqa: F401
+    except ImportError as e:
+        print(f"❌ 필요한 패키지가 설치되지 않았습니다: {e}")
+        print("설치 명령어: pip install -r requirements.txt websockets")
+        return False
+
+    if args.serve:
+        serve(args)
+        return True
+
+    print("🔍 부하 테스트 시작")
+    print(f"세션: {args.sessions} / 키워드 수: {args.library_sizes} / "
+          f"세션당 동작: {args.actions} / 백엔드 지연: {args.latency_ms}ms / 동작 간 대기: 0~{args.think_ms}ms")
+
+    # keywords_data.json이 저장소를 더럽히지 않도록 임시 폴더에서 서버 실행
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, '.streamlit'))
+        with open(os.path.join(workdir, '.streamlit', 'secrets.toml'), 'w', encoding='utf-8') as f:
+            f.write('SUPABASE_URL = "http://load-test.local"\nSUPABASE_ANON_KEY = "load-test"\n')
+
+        for library_size in args.library_sizes:
+            for n_sessions in args.sessions:
+                print(f"▶️ 세션 {n_sessions}개 × 키워드 {library_size}개 실행 중...")
+                for leftover in ('keywords_data.json', STATS_FILE):
+                    if os.path.exists(os.path.join(workdir, leftover)):
+                        os.remove(os.path.join(workdir, leftover))
+                results.append(run_scenario(workdir, n_sessions, library_size, args))
+
+    print_report(results)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
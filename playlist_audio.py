@@ -0,0 +1,165 @@
+"""
+학습 플레이리스트 오프라인 음성 렌더링 모듈
+키워드 목록을 한국어 → 쉼 → 영어 순서로 합성해 하나의 WAV 파일로 만듭니다.
+
+합성은 spawn 방식의 워커 프로세스 풀에서 실행되므로 이 모듈은 streamlit을 import하지 않습니다.
+(워커 프로세스가 app.py 전체를 다시 실행하지 않도록 분리)
+"""
+
+import multiprocessing
+import os
+import re
+import tempfile
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+try:
+    import pyttsx3
+    OFFLINE_TTS_AVAILABLE = True
+except ImportError:
+    pyttsx3 = None
+    OFFLINE_TTS_AVAILABLE = False
+
+# 워커 프로세스별 TTS 엔진 (프로세스당 한 번만 초기화)
+_engine = None
+
+
+def _init_worker():
+    """워커 프로세스 시작 시 오프라인 TTS 엔진 초기화"""
+    global _engine
+    _engine = pyttsx3.init()
+    _engine.setProperty('rate', 150)
+
+
+# 언어 코드가 없는 음성을 이름으로 찾을 때 쓰는 언어 이름
+_LANGUAGE_NAMES = {'ko': ('korean', '한국어'), 'en': ('english',)}
+
+
+def _voice_languages(voice):
+    """음성의 언어 코드 목록 (espeak이 앞에 붙이는 우선순위 바이트 제거, 'en_US' -> 'en-us')"""
+    codes = []
+    for lang in voice.languages or []:
+        if isinstance(lang, bytes):
+            if lang and lang[0] < 0x20:
+                lang = lang[1:]
+            lang = lang.decode('utf-8', 'ignore')
+        lang = str(lang).lstrip(''.join(chr(c) for c in range(0x20))).strip()
+        if lang:
+            codes.append(lang.lower().replace('_', '-'))
+    return codes
+
+
+def _matches_language(voice, lang_code):
+    """언어 코드가 정확히 같거나 지역 코드만 다른 경우 (en, en-gb, en-us)"""
+    return any(
+        code == lang_code or code.startswith(lang_code + '-')
+        for code in _voice_languages(voice)
+    )
+
+
+def _matches_name(voice, lang_code):
+    """언어 코드 정보가 없을 때 음성 ID/이름의 단어로 판단 ('en'이 'Bengali'에 걸리지 않도록 단어 단위 비교)"""
+    words = re.split(r'[^0-9a-z가-힣]+', f"{voice.id} {voice.name or ''}".lower())
+    names = (lang_code,) + _LANGUAGE_NAMES.get(lang_code, ())
+    return any(word in names for word in words)
+
+
+def _select_voice(lang, voice_gender):
+    """언어와 성별에 맞는 음성 선택 (성별이 맞는 음성이 없으면 언어만 맞춤)"""
+    lang_code = 'ko' if lang == 'ko' else 'en'
+    gender = 'female' if voice_gender == '여성' else 'male'
+    voices = _engine.getProperty('voices')
+
+    candidates = [v for v in voices if _matches_language(v, lang_code)]
+    if not candidates:
+        candidates = [v for v in voices if _matches_name(v, lang_code)]
+
+    for voice in candidates:
+        if (voice.gender or '').lower() == gender:
+            return voice.id
+    return candidates[0].id if candidates else None
+
+
+def _synthesize(text, lang, voice_gender):
+    """텍스트 하나를 합성해 (WAV 파라미터, 프레임 바이트) 반환"""
+    voice_id = _select_voice(lang, voice_gender)
+    if voice_id:
+        _engine.setProperty('voice', voice_id)
+
+    fd, path = tempfile.mkstemp(suffix='.wav')
+    os.close(fd)
+    try:
+        _engine.save_to_file(text, path)
+        _engine.runAndWait()
+        with wave.open(path, 'rb') as wav:
+            params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+            frames = wav.readframes(wav.getnframes())
+        return params, frames
+    finally:
+        os.remove(path)
+
+
+def _render_item(job):
+    """키워드 하나를 한국어 → 쉼 → 영어 순서로 합성"""
+    korean, english, voice_gender, pause_ms = job
+    ko_params, ko_frames = _synthesize(korean, 'ko', voice_gender)
+    en_params, en_frames = _synthesize(english, 'en', voice_gender)
+    if ko_params != en_params:
+        raise ValueError(f"음성 형식이 일치하지 않습니다: {ko_params} != {en_params}")
+    return ko_params, ko_frames + _silence(ko_params, pause_ms) + en_frames
+
+
+def _silence(params, duration_ms):
+    """주어진 WAV 형식의 무음 프레임 생성"""
+    channels, sampwidth, framerate = params
+    n_frames = int(framerate * duration_ms / 1000)
+    return b'\x00' * (n_frames * channels * sampwidth)
+
+
+def render_playlist(keywords, voice_gender='여성', pause_ms=700, gap_ms=1500,
+                    max_workers=None, on_progress=None):
+    """
+    키워드 목록을 하나의 WAV 파일(bytes)로 렌더링
+
+    각 키워드는 워커 풀에서 병렬로 합성되고, 완료되는 대로 순서대로 WAV 버퍼에 이어 씁니다.
+    on_progress(완료 수, 전체 수) 콜백으로 진행 상황을 알립니다.
+    """
+    if not OFFLINE_TTS_AVAILABLE:
+        raise RuntimeError("pyttsx3 패키지가 설치되지 않았습니다. (pip install pyttsx3)")
+    if not keywords:
+        raise ValueError("렌더링할 키워드가 없습니다.")
+
+    jobs = [(k['korean'], k['english'], voice_gender, pause_ms) for k in keywords]
+    total = len(jobs)
+    # 워커당 여러 항목을 묶어 보내 프로세스 간 통신 비용을 줄임
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, total // (workers * 4))
+
+    buffer = BytesIO()
+    wav_out = None
+    params = None
+    # 멀티스레드인 Streamlit 서버를 fork하면 잠금 교착이나 다른 세션 데이터 복사가 생기므로 spawn 사용
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        # map은 입력 순서를 유지하면서 결과가 나오는 대로 반환
+        for done, (item_params, frames) in enumerate(
+                executor.map(_render_item, jobs, chunksize=chunksize), start=1):
+            if wav_out is None:
+                params = item_params
+                wav_out = wave.open(buffer, 'wb')
+                wav_out.setnchannels(params[0])
+                wav_out.setsampwidth(params[1])
+                wav_out.setframerate(params[2])
+            elif item_params != params:
+                raise ValueError(f"음성 형식이 일치하지 않습니다: {item_params} != {params}")
+
+            if done > 1:
+                wav_out.writeframes(_silence(params, gap_ms))
+            wav_out.writeframes(frames)
+
+            if on_progress:
+                on_progress(done, total)
+
+    wav_out.close()
+    return buffer.getvalue()
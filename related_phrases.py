@@ -0,0 +1,281 @@
+"""
+비슷한 표현 추천 모듈
+영어/한국어 문자 n-gram TF-IDF 벡터(SciPy 희소 행렬)의 코사인 유사도로
+라이브러리 안에서 가장 비슷한 키워드를 찾습니다.
+"""
+
+import numpy as np
+from scipy import sparse
+
+# 한 번에 계산할 질의 행 수 (질의 수 × 키워드 수 밀집 배열 메모리 제한)
+QUERY_CHUNK_SIZE = 16
+
+# 재구성 이후 추가/삭제된 행이 이 수와 전체의 비율을 모두 넘으면 행렬을 다시 만듦
+COMPACT_MIN_ROWS = 256
+COMPACT_RATIO = 0.1
+
+
+def _char_ngrams(text, prefix, ngram_range):
+    """공백으로 감싼 소문자 텍스트의 문자 n-gram (언어 구분 접두어 포함)"""
+    text = f" {' '.join(text.lower().split())} "
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for i in range(len(text) - n + 1):
+            yield prefix + text[i:i + n]
+
+
+class PhraseSimilarity:
+    """
+    키워드 문자 n-gram TF-IDF 유사도 모델
+
+    정규화된 TF-IDF 행렬은 base(마지막 재구성 시점) + delta(이후 추가된 행)로 나눠 두고,
+    추가는 delta에 행을 붙이기만, 삭제는 생존 표시만 바꿉니다.
+    추가/삭제가 쌓이면 한 번에 재구성해 삭제된 행을 정리하고 IDF를 갱신합니다.
+    이웃 결과는 키워드별로 캐시되며, 추가된 키워드는 캐시된 키워드와의 유사도만 계산해 반영합니다.
+    """
+
+    def __init__(self, keywords=(), ngram_range=(2, 3)):
+        self.ngram_range = ngram_range
+        self.vocab = {}            # n-gram -> 열 번호
+        self.ids = []              # 행 번호 -> 키워드 ID (삭제 시 None)
+        self.rows = {}             # 키워드 ID -> 행 번호
+        self.keywords = {}         # 키워드 ID -> 키워드
+        self.df = np.zeros(0)      # 열별 문서 빈도
+        self._tf_rows = []         # 행 번호 -> (열 번호, 빈도) 원본 TF (재구성용, 삭제 시 None)
+        self._idf = np.zeros(0)    # 열별 IDF (재구성 이후 새 n-gram은 처음 나온 시점 값으로 고정)
+        self._base = sparse.csr_matrix((0, 0))
+        self._delta_rows = []      # base 이후 추가된 정규화 행 (열 번호, 값)
+        self._delta = None         # _delta_rows의 CSR 캐시
+        self._alive = bytearray()  # 행별 생존 여부
+        self._n_dead = 0
+        self._neighbors = {}       # 키워드 ID -> [(이웃 ID, 유사도), ...]
+        self._k = 0                # 캐시된 이웃 수
+
+        for keyword in keywords:
+            self._append_row(keyword)
+        self._compact()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _vectorize(self, keyword):
+        """키워드 하나를 (열 번호 배열, 빈도 배열)로 변환 (새 n-gram은 어휘에 추가)"""
+        counts = {}
+        for gram in _char_ngrams(keyword['english'], 'e:', self.ngram_range):
+            counts[gram] = counts.get(gram, 0) + 1
+        for gram in _char_ngrams(keyword['korean'], 'k:', self.ngram_range):
+            counts[gram] = counts.get(gram, 0) + 1
+
+        cols = np.fromiter(
+            (self.vocab.setdefault(gram, len(self.vocab)) for gram in counts),
+            dtype=np.int64, count=len(counts)
+        )
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return cols, values
+
+    def _append_row(self, keyword):
+        """TF 행 추가 + DF 증분 갱신 (가중치 계산은 호출한 쪽에서)"""
+        cols, values = self._vectorize(keyword)
+        if len(self.vocab) > len(self.df):
+            self.df = np.concatenate([self.df, np.zeros(len(self.vocab) - len(self.df))])
+        self.df[cols] += 1
+
+        row = len(self.ids)
+        self.rows[keyword['id']] = row
+        self.ids.append(keyword['id'])
+        self.keywords[keyword['id']] = keyword
+        self._tf_rows.append((cols, values))
+        self._alive.append(1)
+        return row
+
+    def _idf_values(self, df):
+        return np.log((1 + len(self.rows)) / (1 + df)) + 1
+
+    def _weighted_row(self, cols, values):
+        """TF 행 하나를 현재 IDF로 가중치를 주고 L2 정규화"""
+        if len(self.vocab) > len(self._idf):
+            new_cols = slice(len(self._idf), len(self.vocab))
+            self._idf = np.concatenate([self._idf, self._idf_values(self.df[new_cols])])
+        data = values * self._idf[cols]
+        norm = np.sqrt(np.dot(data, data))
+        return cols, data / norm if norm else data
+
+    def _delta_matrix(self):
+        n_cols = len(self.vocab)
+        if self._delta is None or self._delta.shape[1] != n_cols:
+            if self._delta_rows:
+                lengths = [len(cols) for cols, _ in self._delta_rows]
+                indptr = np.concatenate([[0], np.cumsum(lengths)])
+                indices = np.concatenate([cols for cols, _ in self._delta_rows])
+                data = np.concatenate([values for _, values in self._delta_rows])
+                self._delta = sparse.csr_matrix(
+                    (data, indices, indptr), shape=(len(self._delta_rows), n_cols)
+                )
+            else:
+                self._delta = sparse.csr_matrix((0, n_cols))
+        return self._delta
+
+    def _base_matrix(self):
+        # 새 n-gram 열만큼 모양만 넓힘 (CSR 열 확장은 데이터 복사 없음)
+        n_cols = len(self.vocab)
+        if self._base.shape[1] != n_cols:
+            self._base.resize((self._base.shape[0], n_cols))
+        return self._base
+
+    def _vectors(self, rows):
+        """행 번호 목록에 해당하는 정규화 벡터 (입력 순서 유지)"""
+        n_base = self._base.shape[0]
+        base_pos = [i for i, row in enumerate(rows) if row < n_base]
+        delta_pos = [i for i, row in enumerate(rows) if row >= n_base]
+        matrix = sparse.vstack([
+            self._base_matrix()[[rows[i] for i in base_pos]],
+            self._delta_matrix()[[rows[i] - n_base for i in delta_pos]],
+        ], format='csr')
+        return matrix[np.argsort(base_pos + delta_pos)]
+
+    def _scores(self, queries):
+        """질의 벡터와 전체 행의 코사인 유사도 (삭제된 행은 0)"""
+        scores = np.hstack([
+            (queries @ self._base_matrix().T).toarray(),
+            (queries @ self._delta_matrix().T).toarray(),
+        ])
+        scores *= np.frombuffer(bytes(self._alive), dtype=np.uint8)
+        return scores
+
+    def _compact(self):
+        """삭제된 행을 빼고 현재 DF로 IDF를 다시 계산해 base 행렬 재구성"""
+        live = [row for row, keyword_id in enumerate(self.ids) if keyword_id is not None]
+        self.ids = [self.ids[row] for row in live]
+        self._tf_rows = [self._tf_rows[row] for row in live]
+        self.rows = {keyword_id: row for row, keyword_id in enumerate(self.ids)}
+        self._alive = bytearray(b'\x01' * len(self.ids))
+        self._n_dead = 0
+        self._delta_rows = []
+        self._delta = None
+
+        n_cols = len(self.vocab)
+        self._idf = self._idf_values(self.df)
+        if self._tf_rows:
+            lengths = [len(cols) for cols, _ in self._tf_rows]
+            indptr = np.concatenate([[0], np.cumsum(lengths)])
+            indices = np.concatenate([cols for cols, _ in self._tf_rows])
+            data = np.concatenate([values for _, values in self._tf_rows]) * self._idf[indices]
+            weighted = sparse.csr_matrix((data, indices, indptr), shape=(len(self._tf_rows), n_cols))
+            norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self._base = (sparse.diags(1 / norms) @ weighted).tocsr()
+        else:
+            self._base = sparse.csr_matrix((0, n_cols))
+
+    def _maybe_compact(self):
+        changed = len(self._delta_rows) + self._n_dead
+        if changed > COMPACT_MIN_ROWS and changed > COMPACT_RATIO * len(self.ids):
+            self._compact()
+
+    def _remove_rows(self, keyword_ids):
+        """행 삭제 표시 + DF 감소, 삭제된 키워드를 이웃으로 갖던 캐시만 무효화"""
+        removed = set()
+        for keyword_id in keyword_ids:
+            row = self.rows.pop(keyword_id, None)
+            if row is None:
+                continue
+            cols, _ = self._tf_rows[row]
+            self.df[cols] -= 1
+            self.ids[row] = None
+            self._tf_rows[row] = None
+            self._alive[row] = 0
+            self._n_dead += 1
+            del self.keywords[keyword_id]
+            removed.add(keyword_id)
+
+        if removed:
+            stale = [
+                kid for kid, neighbors in self._neighbors.items()
+                if kid in removed or any(nid in removed for nid, _ in neighbors)
+            ]
+            for kid in stale:
+                del self._neighbors[kid]
+
+    def _add_rows(self, keywords):
+        """delta에 행 추가 후, 캐시된 이웃 목록에 새 키워드를 한 번에 반영"""
+        self._remove_rows([k['id'] for k in keywords if k['id'] in self.rows])
+        new_rows = [self._append_row(keyword) for keyword in keywords]
+        for row in new_rows:
+            self._delta_rows.append(self._weighted_row(*self._tf_rows[row]))
+        self._delta = None
+        if not self._neighbors or not new_rows:
+            return
+
+        cached_ids = list(self._neighbors)
+        # 새 행 × 캐시된 행 유사도만 계산 (전체 행렬 재계산 없음)
+        scores = (self._vectors(new_rows) @ self._vectors([self.rows[kid] for kid in cached_ids]).T).toarray()
+        for j, keyword_id in enumerate(cached_ids):
+            neighbors = self._neighbors[keyword_id]
+            candidates = [
+                (self.ids[row], float(scores[i, j]))
+                for i, row in enumerate(new_rows)
+                if scores[i, j] > 0 and self.ids[row] != keyword_id
+            ]
+            if candidates:
+                neighbors.extend(candidates)
+                neighbors.sort(key=lambda item: item[1], reverse=True)
+                del neighbors[self._k:]
+
+    def add(self, keyword):
+        """키워드 추가"""
+        self.add_many([keyword])
+
+    def add_many(self, keywords):
+        """키워드 여러 개 추가"""
+        self._add_rows(list(keywords))
+        self._maybe_compact()
+
+    def remove(self, keyword_id):
+        """키워드 삭제"""
+        self._remove_rows([keyword_id])
+        self._maybe_compact()
+
+    def update(self, keyword_id, keyword):
+        """키워드 내용 변경"""
+        self.update_many({keyword_id: keyword})
+
+    def update_many(self, keywords_by_id):
+        """
+        키워드 여러 개 변경 {기존 ID: 새 키워드}
+        모두 삭제 표시 → 모두 추가 → 캐시 반영 → 재구성 확인을 한 번씩만 수행
+        """
+        self._remove_rows(list(keywords_by_id))
+        self._add_rows(list(keywords_by_id.values()))
+        self._maybe_compact()
+
+    def neighbors(self, keyword_ids, k=3):
+        """
+        키워드별 가장 비슷한 키워드 k개를 {ID: [(키워드, 유사도), ...]}로 반환
+
+        캐시에 없는 키워드만 모아 QUERY_CHUNK_SIZE 행씩 희소 행렬 곱으로 계산합니다.
+        """
+        if k != self._k:
+            self._neighbors = {}
+            self._k = k
+
+        missing = [kid for kid in keyword_ids if kid in self.rows and kid not in self._neighbors]
+        n_rows = len(self.ids)
+        top = min(k + 1, n_rows)
+        for start in range(0, len(missing), QUERY_CHUNK_SIZE):
+            chunk = missing[start:start + QUERY_CHUNK_SIZE]
+            query_rows = [self.rows[kid] for kid in chunk]
+            scores = self._scores(self._vectors(query_rows))
+            scores[np.arange(len(chunk)), query_rows] = 0  # 자기 자신 제외
+            best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+            for i, kid in enumerate(chunk):
+                ranked = sorted(
+                    ((self.ids[row], float(scores[i, row])) for row in best[i]
+                     if scores[i, row] > 0),
+                    key=lambda item: item[1], reverse=True
+                )
+                self._neighbors[kid] = ranked[:k]
+
+        return {
+            kid: [(self.keywords[nid], score) for nid, score in self._neighbors[kid]]
+            for kid in keyword_ids if kid in self._neighbors
+        }
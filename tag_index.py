@@ -0,0 +1,166 @@
+"""
+키워드 태그 비트맵 인덱스 모듈
+태그마다 키워드 위치를 비트로 표시한 정수 비트맵을 유지해
+AND / OR / NOT 조합 필터를 비트 연산으로 빠르게 계산합니다.
+"""
+
+from collections import Counter
+
+
+def keyword_tags(keyword):
+    """키워드의 태그 목록 (상황은 항상 첫 번째 태그로 포함)"""
+    tags = [keyword['situation']]
+    for tag in keyword.get('tags') or []:
+        if tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def _bitmap_from_positions(positions, size):
+    """비트 위치 목록으로 비트맵을 한 번에 생성 (큰 정수 OR 반복을 피함)"""
+    buf = bytearray((size + 7) // 8)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def _bit_positions(mask):
+    """비트맵에서 켜진 비트 위치를 높은 위치(최신 키워드)부터 반환"""
+    bits = bin(mask)[2:]
+    top = len(bits) - 1
+    i = bits.find('1')
+    while i != -1:
+        yield top - i
+        i = bits.find('1', i + 1)
+
+
+class TagIndex:
+    """
+    태그별 비트맵 + 태그 개수 인덱스
+
+    키워드마다 비트 위치를 하나씩 배정하고(새 키워드일수록 높은 위치),
+    삭제된 위치는 비워 둔 채 live 비트맵에서만 제외합니다.
+    태그 개수는 추가/삭제 시 증감으로만 갱신되므로 사이드바 통계에 바로 쓸 수 있습니다.
+    """
+
+    def __init__(self, keywords=()):
+        self.positions = {}      # 키워드 ID -> 비트 위치
+        self.keywords = []       # 비트 위치 -> 키워드 (삭제 시 None)
+        self.texts = []          # 비트 위치 -> 검색용 소문자 텍스트
+        self.bitmaps = {}        # 태그 -> 비트맵
+        self.counts = Counter()  # 태그 -> 키워드 수
+        self.live = 0            # 삭제되지 않은 키워드 비트맵
+
+        # 목록은 최신순이므로 역순으로 넣어 최신 키워드가 높은 위치를 갖도록 함
+        tag_positions = {}
+        for pos, keyword in enumerate(reversed(list(keywords))):
+            self.keywords.append(keyword)
+            self.texts.append(f"{keyword['korean']}\n{keyword['english']}".lower())
+            self.positions[keyword['id']] = pos
+            for tag in keyword_tags(keyword):
+                tag_positions.setdefault(tag, []).append(pos)
+
+        size = len(self.keywords)
+        self.live = _bitmap_from_positions(range(size), size)
+        for tag, positions in tag_positions.items():
+            self.bitmaps[tag] = _bitmap_from_positions(positions, size)
+            self.counts[tag] = len(positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add(self, keyword):
+        """키워드 추가 (가장 최신 위치에 배정)"""
+        if keyword['id'] in self.positions:
+            self.remove(keyword['id'])
+        pos = len(self.keywords)
+        self.keywords.append(keyword)
+        self.texts.append(f"{keyword['korean']}\n{keyword['english']}".lower())
+        self.positions[keyword['id']] = pos
+        self._set_bits(pos, keyword)
+
+    def remove(self, keyword_id):
+        """키워드 삭제 (위치는 재사용하지 않음)"""
+        pos = self.positions.pop(keyword_id, None)
+        if pos is None:
+            return
+        self._clear_bits(pos, self.keywords[pos])
+        self.keywords[pos] = None
+        self.texts[pos] = ''
+
+    def update(self, keyword_id, keyword):
+        """키워드 내용/태그 변경 (표시 순서 유지를 위해 기존 위치 재사용)"""
+        self.update_many({keyword_id: keyword})
+
+    def update_many(self, keywords_by_id):
+        """
+        키워드 여러 개 변경 {기존 ID: 새 키워드}
+        태그별로 지울 위치/켤 위치를 모아 비트맵마다 한 번씩만 갱신합니다.
+        """
+        cleared = {}  # 태그 -> 지울 위치 목록
+        added = {}    # 태그 -> 켤 위치 목록
+        for keyword_id, keyword in keywords_by_id.items():
+            pos = self.positions.pop(keyword_id, None)
+            if pos is None:
+                self.add(keyword)
+                continue
+            for tag in keyword_tags(self.keywords[pos]):
+                cleared.setdefault(tag, []).append(pos)
+            for tag in keyword_tags(keyword):
+                added.setdefault(tag, []).append(pos)
+            self.keywords[pos] = keyword
+            self.texts[pos] = f"{keyword['korean']}\n{keyword['english']}".lower()
+            self.positions[keyword['id']] = pos
+
+        size = len(self.keywords)
+        for tag, positions in cleared.items():
+            self.bitmaps[tag] &= ~_bitmap_from_positions(positions, size)
+            self.counts[tag] -= len(positions)
+        for tag, positions in added.items():
+            self.bitmaps[tag] = self.bitmaps.get(tag, 0) | _bitmap_from_positions(positions, size)
+            self.counts[tag] += len(positions)
+        for tag in cleared:
+            if self.counts[tag] <= 0:
+                del self.counts[tag]
+                del self.bitmaps[tag]
+
+    def _set_bits(self, pos, keyword):
+        bit = 1 << pos
+        self.live |= bit
+        for tag in keyword_tags(keyword):
+            self.bitmaps[tag] = self.bitmaps.get(tag, 0) | bit
+            self.counts[tag] += 1
+
+    def _clear_bits(self, pos, keyword):
+        bit = 1 << pos
+        self.live &= ~bit
+        for tag in keyword_tags(keyword):
+            self.bitmaps[tag] &= ~bit
+            self.counts[tag] -= 1
+            if self.counts[tag] <= 0:
+                del self.counts[tag]
+                del self.bitmaps[tag]
+
+    def query(self, all_tags=(), any_tags=(), none_tags=(), text=''):
+        """
+        태그 조건 + 검색어로 키워드 필터링 (최신순)
+
+        all_tags: 모두 포함 (AND), any_tags: 하나 이상 포함 (OR), none_tags: 제외 (NOT)
+        검색어는 태그 조건을 통과한 키워드에만 적용합니다.
+        """
+        mask = self.live
+        for tag in all_tags:
+            mask &= self.bitmaps.get(tag, 0)
+        if any_tags:
+            any_mask = 0
+            for tag in any_tags:
+                any_mask |= self.bitmaps.get(tag, 0)
+            mask &= any_mask
+        for tag in none_tags:
+            mask &= ~self.bitmaps.get(tag, 0)
+
+        text = text.lower()
+        return [
+            self.keywords[pos] for pos in _bit_positions(mask)
+            if not text or text in self.texts[pos]
+        ]